@@ -3,16 +3,31 @@
 
 import sounddevice as sd
 import numpy as np
-from queue import Queue
-import threading
+import time as _time
 
-audio_queue = Queue()
+# Lock-free SPSC ring: the callback only advances head, the reader only advances
+# tail, so the realtime thread never takes a lock or allocates.
+RING_SIZE = 8  # power of two, ~2s of 250ms blocks
+BLOCKSIZE = 4000
+CHANNELS = 1
+
+def _alloc_ring(blocksize, channels):
+    """Allocate ring slots matching the stream's block shape."""
+    return [np.empty((blocksize, channels), dtype=np.int16) for _ in range(RING_SIZE)]
+
+ring_slots = _alloc_ring(BLOCKSIZE, CHANNELS)
+ring_head = 0
+ring_tail = 0
 
 def audio_callback(indata, frames, time, status):
-    """Callback for audio stream - adds chunks to queue."""
+    """Callback for audio stream - copies chunks into the ring."""
+    global ring_head
     if status:
         print(f"Audio status: {status}")
-    audio_queue.put(indata.copy())
+    if ring_head - ring_tail >= RING_SIZE:
+        return  # Ring full, drop block
+    np.copyto(ring_slots[ring_head & (RING_SIZE - 1)], indata)
+    ring_head += 1
 
 def list_audio_devices():
     """List all available audio devices."""
@@ -27,7 +42,7 @@ def find_loopback_device():
             return i
     return None
 
-def start_capture(device_index=None, sample_rate=16000, channels=1, blocksize=4000):
+def start_capture(device_index=None, sample_rate=16000, channels=CHANNELS, blocksize=BLOCKSIZE):
     """
     Start capturing audio.
 
@@ -40,6 +55,12 @@ def start_capture(device_index=None, sample_rate=16000, channels=1, blocksize=40
     Returns:
         InputStream object
     """
+    global ring_slots, ring_head, ring_tail
+    # Slots must match the callback's block shape, or np.copyto fails in
+    # the audio thread
+    ring_slots = _alloc_ring(blocksize, channels)
+    ring_head = ring_tail = 0
+
     stream = sd.InputStream(
         device=device_index,
         channels=channels,
@@ -52,11 +73,16 @@ def start_capture(device_index=None, sample_rate=16000, channels=1, blocksize=40
     return stream
 
 def get_audio_chunk(timeout=1.0):
-    """Get next audio chunk from queue."""
-    try:
-        return audio_queue.get(timeout=timeout)
-    except:
-        return None
+    """Get next audio chunk from the ring."""
+    global ring_tail
+    deadline = _time.monotonic() + timeout
+    while ring_tail == ring_head:
+        if _time.monotonic() >= deadline:
+            return None
+        _time.sleep(0.005)
+    chunk = ring_slots[ring_tail & (RING_SIZE - 1)].copy()
+    ring_tail += 1
+    return chunk
 
 # Usage example:
 if __name__ == "__main__":
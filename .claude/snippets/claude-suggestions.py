@@ -2,11 +2,27 @@
 # Generate sales response suggestions using Claude
 
 import anthropic
+import asyncio
 import os
-from typing import Optional
+import re
+from typing import Callable, Optional
 
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
 
+# Numbered suggestion line, e.g. '1. "Text"' or '10) Text'
+_SUGG_RE = re.compile(r'^\s*(\d+)[.)]\s*"?(.+?)"?\s*$')
+
+# Shared client so the HTTPS connection pool (and TLS session) is reused
+_CLIENT: Optional[anthropic.AsyncAnthropic] = None
+
+
+def _get_client() -> anthropic.AsyncAnthropic:
+    """Return the shared async Claude client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+    return _CLIENT
+
 SYSTEM_TEMPLATE = """You are a real-time sales assistant helping a salesperson during a live call.
 
 ## Your Role
@@ -38,15 +54,16 @@ Provide 2-3 response options the salesperson could use. Format as:
 Keep each under 30 words. Focus on the most effective response first."""
 
 
-def generate_suggestions(
+async def generate_suggestions(
     conversation_context: str,
     last_statement: str,
     playbook: dict,
     model: str = "claude-sonnet-4-20250514",
-    max_tokens: int = 300
+    max_tokens: int = 300,
+    on_suggestion: Optional[Callable[[str], None]] = None
 ) -> Optional[str]:
     """
-    Generate response suggestions using Claude.
+    Generate response suggestions using Claude (streamed).
 
     Args:
         conversation_context: Recent conversation transcript
@@ -54,11 +71,12 @@ def generate_suggestions(
         playbook: Dict with product, objections, value_props keys
         model: Claude model to use
         max_tokens: Maximum response tokens
+        on_suggestion: Called with each suggestion as soon as its line completes
 
     Returns:
         String with numbered suggestions
     """
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    client = _get_client()
 
     system_prompt = SYSTEM_TEMPLATE.format(
         product_description=playbook.get("product", ""),
@@ -69,15 +87,29 @@ def generate_suggestions(
     )
 
     try:
-        response = client.messages.create(
+        full_text = ""
+        pending = ""
+        async with client.messages.stream(
             model=model,
             max_tokens=max_tokens,
             system=system_prompt,
             messages=[
                 {"role": "user", "content": "Generate response suggestions now."}
             ]
-        )
-        return response.content[0].text
+        ) as stream:
+            async for text in stream.text_stream:
+                full_text += text
+                if on_suggestion is None:
+                    continue
+                pending += text
+                while "\n" in pending:
+                    line, pending = pending.split("\n", 1)
+                    for suggestion in parse_suggestions(line):
+                        on_suggestion(suggestion)
+        if on_suggestion is not None:
+            for suggestion in parse_suggestions(pending):
+                on_suggestion(suggestion)
+        return full_text
     except Exception as e:
         print(f"Error generating suggestions: {e}")
         return None
@@ -86,20 +118,10 @@ def generate_suggestions(
 def parse_suggestions(response: str) -> list[str]:
     """Parse numbered suggestions from Claude response."""
     suggestions = []
-    lines = response.strip().split("\n")
-
-    for line in lines:
-        line = line.strip()
-        # Match lines starting with number and period/parenthesis
-        if line and line[0].isdigit() and len(line) > 2:
-            # Remove number prefix
-            if line[1] in ".)" or (line[1] == " " and line[2] in ".)"):
-                suggestion = line.split(" ", 1)[-1].strip()
-                # Remove surrounding quotes if present
-                if suggestion.startswith('"') and suggestion.endswith('"'):
-                    suggestion = suggestion[1:-1]
-                suggestions.append(suggestion)
-
+    for line in response.splitlines():
+        m = _SUGG_RE.match(line)
+        if m:
+            suggestions.append(m.group(2))
     return suggestions
 
 
@@ -126,7 +148,10 @@ if __name__ == "__main__":
 
     last_statement = "That sounds impressive, but honestly, it's more than we budgeted for this quarter."
 
-    response = generate_suggestions(context, last_statement, playbook)
+    response = asyncio.run(generate_suggestions(
+        context, last_statement, playbook,
+        on_suggestion=lambda s: print(f"[streamed] {s}")
+    ))
     print("Raw response:")
     print(response)
     print("\nParsed suggestions:")
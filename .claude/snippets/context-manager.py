@@ -2,17 +2,57 @@
 # Manages rolling conversation buffer and trigger detection
 
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from collections import deque
-from typing import Optional, List
+from itertools import islice
+from typing import Callable, Optional, List
+import re
+import time
+
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def build_phrase_matcher(phrases: List[str]) -> Callable[[str], Optional[str]]:
+    """
+    Compile phrases into a single-pass multi-pattern matcher.
+    Uses an Aho-Corasick automaton if pyahocorasick is installed, otherwise
+    one alternation regex (also a single scan, in C).
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for phrase in phrases:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+
+        def match(text: str) -> Optional[str]:
+            hit = next(automaton.iter(text), None)
+            return hit[1] if hit else None
+
+        return match
+
+    pattern = re.compile("|".join(map(re.escape, phrases)))
+
+    def match(text: str) -> Optional[str]:
+        m = pattern.search(text)
+        return m.group(0) if m else None
+
+    return match
+
 
 @dataclass
 class Utterance:
     """Single utterance in conversation."""
     speaker: str  # "salesperson" or "prospect"
     text: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.monotonic_ns)
     is_final: bool = True
+    formatted: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Formatted once here instead of on every context build
+        self.formatted = f"{self.speaker.title()}: {self.text}"
 
 
 class ConversationBuffer:
@@ -30,6 +70,10 @@ class ConversationBuffer:
         "not the right time", "too busy", "next quarter",
         "not interested", "don't need", "don't see the value"
     ]
+    _match_trigger = staticmethod(build_phrase_matcher(TRIGGER_PHRASES))
+
+    # Pruning at most once a second is plenty for a multi-minute window
+    PRUNE_INTERVAL_NS = 1_000_000_000
 
     def __init__(self, max_duration_seconds: int = 180):
         """
@@ -40,13 +84,38 @@ class ConversationBuffer:
         """
         self.utterances: deque[Utterance] = deque()
         self.max_duration = max_duration_seconds
-        self.last_suggestion_time: Optional[datetime] = None
+        self.last_suggestion_ns: Optional[int] = None
         self.suggestion_cooldown = 5  # seconds between suggestions
+        # Lowercased text of the last 3 utterances, kept up to date in add()
+        self._recent_lower: deque[str] = deque(maxlen=3)
+        self._rolling_lower = ""
+        # Preformatted lines of final utterances, in step with self.utterances
+        self._joined_final: deque[str] = deque()
+        # Trigger state computed once per insert, read by the query methods
+        self._last_prospect: Optional[Utterance] = None
+        self._trigger_pending = False
+        self._pending_objection: Optional[str] = None
+        self._last_prune_ns = time.monotonic_ns()
 
     def add(self, utterance: Utterance) -> None:
-        """Add an utterance to the buffer."""
+        """Add an utterance to the buffer and update trigger state in one pass."""
         self.utterances.append(utterance)
-        self._prune_old()
+        if utterance.is_final:
+            self._joined_final.append(utterance.formatted)
+
+        self._trigger_pending = utterance.is_final and utterance.speaker == "prospect"
+        if self._trigger_pending:
+            self._last_prospect = utterance
+
+        self._recent_lower.append(utterance.text.lower())
+        self._refresh_recent()
+        if utterance.timestamp_ns - self._last_prune_ns > self.PRUNE_INTERVAL_NS:
+            self._prune_old()
+
+    def _refresh_recent(self) -> None:
+        """Rebuild the lowercased recent window and rescan it for triggers."""
+        self._rolling_lower = " ".join(self._recent_lower)
+        self._pending_objection = self._match_trigger(self._rolling_lower)
 
     def add_transcript(self, text: str, speaker: str, is_final: bool = True) -> None:
         """Convenience method to add transcript text."""
@@ -59,33 +128,40 @@ class ConversationBuffer:
 
     def _prune_old(self) -> None:
         """Remove utterances older than max_duration."""
-        cutoff = datetime.now() - timedelta(seconds=self.max_duration)
-        while self.utterances and self.utterances[0].timestamp < cutoff:
-            self.utterances.popleft()
+        now = time.monotonic_ns()
+        self._last_prune_ns = now
+        cutoff = now - self.max_duration * 1_000_000_000
+        while self.utterances and self.utterances[0].timestamp_ns < cutoff:
+            popped = self.utterances.popleft()
+            if popped.is_final:
+                self._joined_final.popleft()
+            # The newest prospect line aging out means no prospect line remains
+            if popped is self._last_prospect:
+                self._last_prospect = None
+        if not self.utterances:
+            self._trigger_pending = False
+        if len(self._recent_lower) > len(self.utterances):
+            while len(self._recent_lower) > len(self.utterances):
+                self._recent_lower.popleft()
+            self._refresh_recent()
 
     def get_context_string(self, last_n: Optional[int] = None) -> str:
         """
         Get conversation as formatted string.
 
         Args:
-            last_n: Only include last N utterances (None for all)
+            last_n: Only include last N final utterances (None for all)
         """
-        utterances = list(self.utterances)
-        if last_n:
-            utterances = utterances[-last_n:]
+        if not last_n:
+            return "\n".join(self._joined_final)
 
-        return "\n".join([
-            f"{u.speaker.title()}: {u.text}"
-            for u in utterances
-            if u.is_final
-        ])
+        lines = list(islice(reversed(self._joined_final), last_n))
+        lines.reverse()
+        return "\n".join(lines)
 
     def get_last_prospect_statement(self) -> Optional[str]:
         """Get the most recent prospect utterance."""
-        for utterance in reversed(self.utterances):
-            if utterance.speaker == "prospect" and utterance.is_final:
-                return utterance.text
-        return None
+        return self._last_prospect.text if self._last_prospect else None
 
     def should_trigger_ai(self) -> bool:
         """
@@ -94,21 +170,16 @@ class ConversationBuffer:
         Returns:
             True if conditions are met for generating suggestions
         """
-        if not self.utterances:
+        # Only trigger on final prospect utterances (flag maintained by add())
+        if not self._trigger_pending:
             return False
 
         # Check cooldown
-        if self.last_suggestion_time:
-            elapsed = (datetime.now() - self.last_suggestion_time).total_seconds()
-            if elapsed < self.suggestion_cooldown:
+        if self.last_suggestion_ns is not None:
+            elapsed_ns = time.monotonic_ns() - self.last_suggestion_ns
+            if elapsed_ns < self.suggestion_cooldown * 1_000_000_000:
                 return False
 
-        last = self.utterances[-1]
-
-        # Only trigger on final prospect utterances
-        if last.speaker != "prospect" or not last.is_final:
-            return False
-
         # Always trigger on prospect speech (they might need a response)
         # Could add more sophisticated logic here
         return True
@@ -120,24 +191,23 @@ class ConversationBuffer:
         Returns:
             Matched trigger phrase or None
         """
-        # Get last 3 utterances as text
-        recent = list(self.utterances)[-3:]
-        recent_text = " ".join([u.text.lower() for u in recent])
-
-        for phrase in self.TRIGGER_PHRASES:
-            if phrase in recent_text:
-                return phrase
-
-        return None
+        # Scanned once per insert over the last 3 utterances
+        return self._pending_objection
 
     def mark_suggestion_sent(self) -> None:
         """Mark that a suggestion was just sent (for cooldown)."""
-        self.last_suggestion_time = datetime.now()
+        self.last_suggestion_ns = time.monotonic_ns()
 
     def clear(self) -> None:
         """Clear all utterances."""
         self.utterances.clear()
-        self.last_suggestion_time = None
+        self._joined_final.clear()
+        self._recent_lower.clear()
+        self._rolling_lower = ""
+        self._last_prospect = None
+        self._trigger_pending = False
+        self._pending_objection = None
+        self.last_suggestion_ns = None
 
     @property
     def utterance_count(self) -> int:
@@ -149,9 +219,9 @@ class ConversationBuffer:
         """Duration of conversation in buffer."""
         if len(self.utterances) < 2:
             return 0
-        first = self.utterances[0].timestamp
-        last = self.utterances[-1].timestamp
-        return (last - first).total_seconds()
+        first = self.utterances[0].timestamp_ns
+        last = self.utterances[-1].timestamp_ns
+        return (last - first) / 1e9
 
 
 # Usage example:
@@ -1,71 +1,120 @@
 # Deepgram Streaming Transcription Snippet
 # Real-time speech-to-text with WebSocket
+# Requires: msgspec>=0.18 (pip install msgspec), on top of backend/requirements.txt
 
 import asyncio
 import websockets
-import json
+import msgspec
 import os
-from queue import Queue
+import urllib.parse
 
 DEEPGRAM_API_KEY = os.environ.get("DEEPGRAM_API_KEY")
 
-async def transcribe_stream(audio_queue: Queue, transcript_callback):
+CLOSE_STREAM = '{"type": "CloseStream"}'
+
+# Query string is fixed for the process, so build it once
+_DG_QS = urllib.parse.urlencode({
+    "encoding": "linear16",
+    "sample_rate": 16000,
+    "channels": 1,
+    "diarize": "true",
+    "punctuate": "true",
+    "interim_results": "true",
+    "endpointing": 300,
+    "vad_events": "true",
+})
+DEEPGRAM_URL = f"wss://api.deepgram.com/v1/listen?{_DG_QS}"
+
+
+# Typed Deepgram message shapes: msgspec decodes straight into these in C,
+# skipping every field we don't declare
+class DGWord(msgspec.Struct):
+    speaker: int = 0
+
+
+class DGAlt(msgspec.Struct):
+    transcript: str = ""
+    # Left undecoded; only parsed when the transcript is non-empty
+    words: msgspec.Raw = msgspec.Raw(b"[]")
+
+
+class DGChannel(msgspec.Struct):
+    alternatives: list[DGAlt] = []
+
+
+# Tagged on "type": only Results frames carry a channel object (VAD events
+# send "channel": [0, 1]), so each message type gets its own Struct
+class DGResult(msgspec.Struct, tag_field="type", tag="Results"):
+    channel: DGChannel = msgspec.field(default_factory=DGChannel)
+    is_final: bool = False
+
+
+class DGMetadata(msgspec.Struct, tag_field="type", tag="Metadata"):
+    pass
+
+
+class DGSpeechStarted(msgspec.Struct, tag_field="type", tag="SpeechStarted"):
+    pass
+
+
+class DGUtteranceEnd(msgspec.Struct, tag_field="type", tag="UtteranceEnd"):
+    pass
+
+
+_decoder = msgspec.json.Decoder(
+    DGResult | DGMetadata | DGSpeechStarted | DGUtteranceEnd
+)
+_words_decoder = msgspec.json.Decoder(list[DGWord])
+
+async def transcribe_stream(audio_queue: asyncio.Queue, transcript_callback):
     """
     Stream audio to Deepgram and receive real-time transcriptions.
 
     Args:
-        audio_queue: Queue containing audio chunks (numpy arrays)
+        audio_queue: asyncio.Queue containing audio chunks (numpy arrays), fed
+            from the audio callback via loop.call_soon_threadsafe(q.put_nowait, chunk)
         transcript_callback: Function called with (transcript, speaker, is_final)
     """
-    url = "wss://api.deepgram.com/v1/listen"
-    params = "?".join([
-        "",
-        "encoding=linear16",
-        "sample_rate=16000",
-        "channels=1",
-        "diarize=true",
-        "punctuate=true",
-        "interim_results=true",
-        "endpointing=300",
-        "vad_events=true"
-    ]).replace("?", "&")[1:]
-
     headers = {"Authorization": f"Token {DEEPGRAM_API_KEY}"}
 
-    async with websockets.connect(url + "?" + params, extra_headers=headers) as ws:
+    # PCM doesn't compress, so skip permessage-deflate on the uplink
+    async with websockets.connect(
+        DEEPGRAM_URL, additional_headers=headers, compression=None, max_size=None
+    ) as ws:
 
         async def send_audio():
             """Send audio chunks to Deepgram."""
             while True:
-                # Get audio from queue (blocking)
-                audio_chunk = await asyncio.get_event_loop().run_in_executor(
-                    None, audio_queue.get
-                )
+                # Await next chunk without a thread-pool hop
+                audio_chunk = await audio_queue.get()
                 if audio_chunk is None:  # Sentinel to stop
-                    await ws.send(json.dumps({"type": "CloseStream"}))
+                    await ws.send(CLOSE_STREAM)
                     break
-                await ws.send(audio_chunk.tobytes())
+                # Send the array's buffer directly instead of a tobytes() copy
+                await ws.send(memoryview(audio_chunk).cast("B"))
 
         async def receive_transcripts():
             """Receive and process transcription results."""
             async for message in ws:
-                data = json.loads(message)
+                try:
+                    data = _decoder.decode(message)
+                except msgspec.ValidationError:
+                    continue  # Message type we don't handle
 
                 # Handle transcription results
-                if data.get("type") == "Results":
-                    channel = data.get("channel", {})
-                    alternatives = channel.get("alternatives", [{}])
+                if type(data) is DGResult:
+                    alternatives = data.channel.alternatives
 
                     if alternatives:
-                        transcript = alternatives[0].get("transcript", "")
-                        words = alternatives[0].get("words", [])
-                        is_final = data.get("is_final", False)
+                        transcript = alternatives[0].transcript
+                        if not transcript.strip():
+                            continue
 
                         # Get speaker from first word if diarization enabled
-                        speaker = words[0].get("speaker", 0) if words else 0
+                        words = _words_decoder.decode(alternatives[0].words)
+                        speaker = words[0].speaker if words else 0
 
-                        if transcript.strip():
-                            transcript_callback(transcript, speaker, is_final)
+                        transcript_callback(transcript, speaker, data.is_final)
 
         # Run send and receive concurrently
         await asyncio.gather(send_audio(), receive_transcripts())
@@ -80,11 +129,9 @@ def on_transcript(transcript: str, speaker: int, is_final: bool):
 
 # Usage example:
 if __name__ == "__main__":
-    from queue import Queue
-
-    audio_queue = Queue()
+    audio_queue = asyncio.Queue()
 
-    # In real usage, populate audio_queue from audio capture
-    # audio_queue.put(audio_chunk)
+    # In real usage, populate audio_queue from the audio capture thread:
+    # loop.call_soon_threadsafe(audio_queue.put_nowait, audio_chunk)
 
     asyncio.run(transcribe_stream(audio_queue, on_transcript))
@@ -1,35 +1,35 @@
 # WebSocket Server Snippet
 # IPC between Python backend and Electron frontend
+# Requires: msgspec>=0.18 (pip install msgspec), on top of backend/requirements.txt
 
 import asyncio
 import websockets
 import json
 from typing import Set, Callable
-from dataclasses import dataclass, asdict
+import msgspec
 
-@dataclass
-class TranscriptMessage:
-    type: str = "transcript"
+# Messages are msgspec Structs: msgspec.json.encode() serializes them straight
+# to bytes in one C pass, with "type" emitted from the struct tag.
+
+class TranscriptMessage(msgspec.Struct, tag="transcript", tag_field="type"):
     text: str = ""
     speaker: str = "unknown"
     is_final: bool = False
 
-@dataclass
-class SuggestionsMessage:
-    type: str = "suggestions"
-    items: list = None
-
-    def __post_init__(self):
-        if self.items is None:
-            self.items = []
+class SuggestionsMessage(msgspec.Struct, tag="suggestions", tag_field="type"):
+    items: list[str] = []
 
-@dataclass
-class StatusMessage:
-    type: str = "status"
+class StatusMessage(msgspec.Struct, tag="status", tag_field="type"):
     listening: bool = False
     connected: bool = True
 
 
+def encode_message(message) -> str:
+    """Serialize a Struct or plain dict for a text frame."""
+    # The UI JSON.parse()s text frames, so keep sending str rather than bytes
+    return msgspec.json.encode(message).decode()
+
+
 class WebSocketServer:
     """WebSocket server for frontend communication."""
 
@@ -54,22 +54,17 @@ class WebSocketServer:
     async def send_to_client(self, websocket, message):
         """Send message to a specific client."""
         try:
-            if hasattr(message, '__dataclass_fields__'):
-                data = asdict(message)
-            else:
-                data = message
-            await websocket.send(json.dumps(data))
+            await websocket.send(encode_message(message))
         except websockets.exceptions.ConnectionClosed:
             await self.unregister(websocket)
 
     async def broadcast(self, message):
         """Send message to all connected clients."""
-        if self.clients:
-            data = asdict(message) if hasattr(message, '__dataclass_fields__') else message
-            await asyncio.gather(
-                *[client.send(json.dumps(data)) for client in self.clients],
-                return_exceptions=True
-            )
+        if not self.clients:
+            return
+        # Encode once; websockets.broadcast writes the same frame to every
+        # client without per-client coroutines (slow clients are skipped)
+        websockets.broadcast(self.clients, encode_message(message))
 
     async def handler(self, websocket, path):
         """Handle WebSocket connection."""
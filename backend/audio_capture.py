@@ -5,16 +5,117 @@ Captures system audio using sounddevice with loopback support.
 
 import asyncio
 import logging
+import math
 import platform
+import re
+import time
 from typing import Optional, Callable, Any
-from queue import Queue, Empty
-import threading
 
 import numpy as np
 import sounddevice as sd
 
 logger = logging.getLogger(__name__)
 
+# Loopback device name patterns per platform (case-insensitive)
+_LOOPBACK_RES = {
+    "Darwin": re.compile(r"blackhole|soundflower|loopback", re.IGNORECASE),
+    "Windows": re.compile(r"loopback|stereo mix|what u hear|wave out", re.IGNORECASE),
+    "Linux": re.compile(r"loopback|monitor", re.IGNORECASE),
+}
+
+
+class SpscRingBuffer:
+    """
+    Lock-free single-producer/single-consumer ring of preallocated audio blocks.
+
+    The producer (PortAudio callback thread) only advances ``head`` and the
+    consumer only advances ``tail``. Plain int stores are atomic under the GIL,
+    so neither side takes a lock or allocates on the realtime path.
+    """
+
+    def __init__(self, capacity: int, blocksize: int, channels: int):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Minimum number of slots (rounded up to a power of two)
+            blocksize: Samples per slot
+            channels: Number of channels per sample
+        """
+        size = 1
+        while size < capacity:
+            size <<= 1
+
+        self._mask = size - 1
+        # One contiguous int16 PCM arena; each slot is a numpy view into it,
+        # so pushes are a single memcpy into already-serialized bytes
+        self._arena = bytearray(size * blocksize * channels * 2)
+        self._slots = list(
+            np.frombuffer(self._arena, dtype=np.int16).reshape(
+                size, blocksize, channels
+            )
+        )
+        self._frames = [0] * size
+        self._head = 0
+        self._tail = 0
+        self.overruns = 0
+
+    def push(self, data: np.ndarray, frames: int) -> bool:
+        """
+        Copy a block into the next free slot (producer side).
+
+        Args:
+            data: Audio block of shape (frames, channels), int16 or
+                already-scaled float (cast without a temporary)
+            frames: Number of valid frames in data
+
+        Returns:
+            False if the ring was full and the block was dropped
+        """
+        head = self._head
+        if head - self._tail > self._mask:
+            self.overruns += 1
+            return False
+
+        idx = head & self._mask
+        slot = self._slots[idx]
+        if frames == len(slot):
+            np.copyto(slot, data, casting="unsafe")
+        else:
+            np.copyto(slot[:frames], data[:frames], casting="unsafe")
+        self._frames[idx] = frames
+        self._head = head + 1
+        return True
+
+    def pop(self) -> Optional[np.ndarray]:
+        """
+        Take the oldest block out of the ring (consumer side).
+
+        Returns:
+            Copy of the block, or None if the ring is empty
+        """
+        tail = self._tail
+        if tail == self._head:
+            return None
+
+        idx = tail & self._mask
+        chunk = self._slots[idx][: self._frames[idx]].copy()
+        self._tail = tail + 1
+        return chunk
+
+    def reset(self) -> None:
+        """Discard all queued blocks. Only safe while the producer is stopped."""
+        self._head = self._tail = 0
+        self.overruns = 0
+
+    @property
+    def capacity(self) -> int:
+        """Number of slots in the ring."""
+        return self._mask + 1
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
 
 class AudioCapture:
     """
@@ -22,6 +123,9 @@ class AudioCapture:
     Supports macOS (via BlackHole) and Windows (via WASAPI loopback).
     """
 
+    # Consumer poll interval while the ring is empty (seconds)
+    POLL_INTERVAL = 0.005
+
     def __init__(
         self,
         sample_rate: int = 16000,
@@ -44,9 +148,19 @@ class AudioCapture:
         self.device_index = device_index
 
         self._stream: Optional[sd.InputStream] = None
-        self._audio_queue: Queue = Queue()
+        # ~2s of headroom so a stalled consumer doesn't immediately overrun
+        self._ring = SpscRingBuffer(
+            capacity=math.ceil(2 * sample_rate / blocksize),
+            blocksize=blocksize,
+            channels=channels,
+        )
+        # Scratch for the (normally unused) float input path
+        self._scratch_f32 = np.empty((blocksize, channels), dtype=np.float32)
         self._is_running = False
         self._error_callback: Optional[Callable] = None
+        # Event loop of the async consumer, woken from the audio thread
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._data_ready = asyncio.Event()
 
     def _audio_callback(
         self,
@@ -55,19 +169,32 @@ class AudioCapture:
         time_info: Any,
         status: sd.CallbackFlags,
     ) -> None:
-        """Callback for audio stream - adds chunks to queue."""
+        """Callback for audio stream - copies chunks into the ring buffer."""
         if status:
             logger.warning(f"Audio callback status: {status}")
             if self._error_callback:
                 self._error_callback(str(status))
 
-        # Convert to int16 if needed and add to queue
+        # Convert to int16 if needed in one preallocated scratch pass;
+        # start() opens the stream as int16 so this is normally skipped
         if indata.dtype != np.int16:
-            audio_data = (indata * 32767).astype(np.int16)
-        else:
-            audio_data = indata.copy()
-
-        self._audio_queue.put(audio_data)
+            scratch = self._scratch_f32
+            if frames != len(scratch):
+                scratch = scratch[:frames]
+            np.multiply(indata, 32767.0, out=scratch)
+            np.rint(scratch, out=scratch)
+            indata = scratch
+
+        # Only wake the consumer on the empty -> non-empty transition; while
+        # it is behind it drains the ring without waiting on the event. This
+        # is checked after the push: the copy releases the GIL, so the
+        # consumer may drain the ring and start waiting mid-push.
+        if (
+            self._ring.push(indata, frames)
+            and len(self._ring) == 1
+            and self._loop is not None
+        ):
+            self._loop.call_soon_threadsafe(self._data_ready.set)
 
     @staticmethod
     def list_devices() -> list[dict]:
@@ -93,23 +220,12 @@ class AudioCapture:
             Device index or None if not found
         """
         devices = sd.query_devices()
-        system = platform.system()
-
-        # Keywords to search for
-        if system == "Darwin":  # macOS
-            keywords = ["blackhole", "soundflower", "loopback"]
-        elif system == "Windows":
-            keywords = ["loopback", "stereo mix", "what u hear", "wave out"]
-        else:
-            keywords = ["loopback", "monitor"]
+        pattern = _LOOPBACK_RES.get(platform.system(), _LOOPBACK_RES["Linux"])
 
         for i, device in enumerate(devices):
-            name = device["name"].lower()
-            if device["max_input_channels"] > 0:
-                for keyword in keywords:
-                    if keyword in name:
-                        logger.info(f"Found loopback device: {device['name']} (index {i})")
-                        return i
+            if device["max_input_channels"] > 0 and pattern.search(device["name"]):
+                logger.info(f"Found loopback device: {device['name']} (index {i})")
+                return i
 
         logger.warning("No loopback device found automatically")
         return None
@@ -126,6 +242,10 @@ class AudioCapture:
             return
 
         self._error_callback = error_callback
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
 
         # Auto-detect device if not specified
         device = self.device_index
@@ -166,18 +286,17 @@ class AudioCapture:
             self._stream = None
 
         self._is_running = False
-        # Clear queue
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except Empty:
-                break
+        self._loop = None
+        if self._ring.overruns:
+            logger.warning(f"Audio ring overruns: {self._ring.overruns} chunks dropped")
+        # Stream is closed, so both indices can be reset at once
+        self._ring.reset()
 
         logger.info("Audio capture stopped")
 
     def get_chunk(self, timeout: float = 1.0) -> Optional[np.ndarray]:
         """
-        Get next audio chunk from queue (blocking).
+        Get next audio chunk from the ring (blocking).
 
         Args:
             timeout: Maximum seconds to wait
@@ -185,10 +304,15 @@ class AudioCapture:
         Returns:
             Audio data as numpy array, or None if timeout
         """
-        try:
-            return self._audio_queue.get(timeout=timeout)
-        except Empty:
-            return None
+        deadline = time.monotonic() + timeout
+        while True:
+            chunk = self._ring.pop()
+            if chunk is not None:
+                return chunk
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(remaining, self.POLL_INTERVAL))
 
     async def get_chunk_async(self, timeout: float = 1.0) -> Optional[np.ndarray]:
         """
@@ -200,14 +324,27 @@ class AudioCapture:
         Returns:
             Audio data as numpy array, or None if timeout
         """
-        loop = asyncio.get_event_loop()
-        try:
-            return await asyncio.wait_for(
-                loop.run_in_executor(None, self._audio_queue.get),
-                timeout=timeout,
-            )
-        except asyncio.TimeoutError:
-            return None
+        chunk = self._ring.pop()
+        if chunk is not None:
+            return chunk
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while chunk is None:
+            # Clear before re-checking so a wakeup racing the check isn't lost
+            self._data_ready.clear()
+            chunk = self._ring.pop()
+            if chunk is not None:
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._data_ready.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return self._ring.pop()
+            chunk = self._ring.pop()
+        return chunk
 
     @property
     def is_running(self) -> bool:
@@ -216,8 +353,8 @@ class AudioCapture:
 
     @property
     def queue_size(self) -> int:
-        """Get current queue size."""
-        return self._audio_queue.qsize()
+        """Get number of chunks waiting in the ring."""
+        return len(self._ring)
 
     def __enter__(self):
         """Context manager entry."""
@@ -150,18 +150,29 @@ Provide 2-3 response options the salesperson could use. Format as:
 Keep each under 30 words. Focus on the most effective response first."""
 
 
+# Static part of the prompt (product, pricing, value props) is formatted once at
+# import; only the conversation section is filled in per request.
+_PRICING_INFO = "\n".join(
+    f"- {p['tier']}: {p['price']}" for p in PRODUCT_CONTEXT["pricing"]
+)
+_VALUE_PROPS = "\n".join(f"- {v}" for v in VALUE_PROPOSITIONS)
+
+_SPLIT_MARKER = "## Current Conversation"
+_split_at = SYSTEM_PROMPT_TEMPLATE.index(_SPLIT_MARKER)
+_PROMPT_PREFIX = SYSTEM_PROMPT_TEMPLATE[:_split_at].format(
+    product_name=PRODUCT_CONTEXT["name"],
+    product_description=PRODUCT_CONTEXT["description"],
+    pricing_info=_PRICING_INFO,
+    value_props=_VALUE_PROPS,
+)
+_PROMPT_SUFFIX_TEMPLATE = SYSTEM_PROMPT_TEMPLATE[_split_at:]
+
+
 def get_system_prompt(conversation_transcript: str, last_statement: str) -> str:
     """Build the complete system prompt with current context."""
-    pricing_info = "\n".join(
-        [f"- {p['tier']}: {p['price']}" for p in PRODUCT_CONTEXT["pricing"]]
-    )
-    value_props = "\n".join([f"- {v}" for v in VALUE_PROPOSITIONS])
-
-    return SYSTEM_PROMPT_TEMPLATE.format(
-        product_name=PRODUCT_CONTEXT["name"],
-        product_description=PRODUCT_CONTEXT["description"],
-        pricing_info=pricing_info,
-        value_props=value_props,
-        conversation_transcript=conversation_transcript,
-        last_prospect_statement=last_statement,
+    return _PROMPT_PREFIX + _PROMPT_SUFFIX_TEMPLATE.format_map(
+        {
+            "conversation_transcript": conversation_transcript,
+            "last_prospect_statement": last_statement,
+        }
     )
@@ -4,23 +4,70 @@ Maintains rolling conversation buffer and detects when to trigger AI suggestions
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from collections import deque
+from itertools import islice
 from typing import Optional, List
 import logging
+import re
+import time
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 from config import OBJECTION_TRIGGERS
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Speaker labels: stored lowercase, displayed titlecased in the LLM context
+PROSPECT = "prospect"
+SALESPERSON = "salesperson"
+PROSPECT_LABEL = "Prospect"
+SALESPERSON_LABEL = "Salesperson"
+_DISPLAY_LABELS = {PROSPECT: PROSPECT_LABEL, SALESPERSON: SALESPERSON_LABEL}
+
+# Shortest prospect statement that can trigger suggestions
+MIN_TRIGGER_LENGTH = 10
+
+
+# Multi-pattern matcher over OBJECTION_TRIGGERS, built once so each check is a
+# single pass over the text. Falls back to one alternation regex when
+# pyahocorasick isn't installed.
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _index, _phrase in enumerate(OBJECTION_TRIGGERS):
+        _AUTOMATON.add_word(_phrase, (_index, _phrase))
+    _AUTOMATON.make_automaton()
+    _MAX_TRIGGER_LEN = max(map(len, OBJECTION_TRIGGERS))
+
+    def _find_trigger(text: str) -> Optional[str]:
+        # Hits arrive in order of end position; report the leftmost-starting
+        # one (ties go to the earlier trigger) to match the regex fallback
+        best = None
+        for end, (index, phrase) in _AUTOMATON.iter(text):
+            if best is not None and end - _MAX_TRIGGER_LEN + 1 > best[0]:
+                break
+            key = (end - len(phrase) + 1, index)
+            if best is None or key < best[:2]:
+                best = (*key, phrase)
+        return best[2] if best else None
+
+else:
+    _TRIGGER_RE = re.compile("|".join(map(re.escape, OBJECTION_TRIGGERS)))
+
+    def _find_trigger(text: str) -> Optional[str]:
+        match = _TRIGGER_RE.search(text)
+        return match.group(0) if match else None
+
+
+@dataclass(slots=True)
 class Utterance:
     """Single utterance in conversation."""
 
     speaker: str  # "salesperson" or "prospect"
     text: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=time.monotonic)
     is_final: bool = True
 
 
@@ -45,8 +92,16 @@ class ConversationBuffer:
         self.utterances: deque[Utterance] = deque()
         self.max_duration = max_duration_seconds
         self.suggestion_cooldown = suggestion_cooldown
-        self.last_suggestion_time: Optional[datetime] = None
+        self.last_suggestion_time: Optional[float] = None
         self._pending_interim: Optional[Utterance] = None
+        # Lowercased text of the last 3 final utterances, for trigger matching
+        self._recent_lower: deque[str] = deque(maxlen=3)
+        # Most recent final prospect utterance, maintained by add()/_prune_old()
+        self._last_prospect: Optional[Utterance] = None
+        # Preformatted "Speaker: text" lines, in lockstep with self.utterances
+        self._formatted_lines: deque[str] = deque()
+        # Set once the pending interim has triggered suggestions
+        self._interim_committed = False
 
     def add(self, utterance: Utterance) -> None:
         """Add an utterance to the buffer."""
@@ -54,13 +109,30 @@ class ConversationBuffer:
         if utterance.is_final:
             self._pending_interim = None
             self.utterances.append(utterance)
+            # Lowercased once, when the final is added
+            self._recent_lower.append(utterance.text.lower())
+            label = _DISPLAY_LABELS.get(utterance.speaker) or utterance.speaker.title()
+            self._formatted_lines.append(f"{label}: {utterance.text}")
+            if utterance.speaker == PROSPECT:
+                self._last_prospect = utterance
             self._prune_old()
             logger.debug(
-                f"Added final utterance from {utterance.speaker}: {utterance.text[:50]}..."
+                "Added final utterance from %s: %.50s...",
+                utterance.speaker,
+                utterance.text,
             )
         else:
-            # Store interim result (overwrite previous interim)
-            self._pending_interim = utterance
+            # Store interim result (overwrite previous interim). A repeat of
+            # the same text keeps the earlier timestamp, so the pending
+            # interim's timestamp is when its text last changed.
+            pending = self._pending_interim
+            if (
+                pending is None
+                or pending.text != utterance.text
+                or pending.speaker != utterance.speaker
+            ):
+                self._pending_interim = utterance
+                self._interim_committed = False
 
     def add_transcript(
         self, text: str, speaker: int, is_final: bool = True
@@ -73,22 +145,47 @@ class ConversationBuffer:
             speaker: Speaker ID from diarization (0 or 1)
             is_final: Whether this is a final or interim result
         """
-        # Map speaker ID to label (0 = first speaker detected, usually prospect on calls)
-        # This is a simplification - in production would need calibration
-        speaker_label = "prospect" if speaker == 0 else "salesperson"
-
         utterance = Utterance(
-            speaker=speaker_label,
+            speaker=self.speaker_label(speaker),
             text=text.strip(),
             is_final=is_final,
         )
         self.add(utterance)
 
+    @staticmethod
+    def speaker_label(speaker_id: int) -> str:
+        """
+        Map a diarization speaker ID to a speaker label.
+
+        Args:
+            speaker_id: Speaker ID from diarization (0 or 1)
+
+        Returns:
+            PROSPECT or SALESPERSON
+        """
+        # 0 = first speaker detected, usually prospect on calls.
+        # This is a simplification - in production would need calibration
+        return PROSPECT if speaker_id == 0 else SALESPERSON
+
     def _prune_old(self) -> None:
         """Remove utterances older than max_duration."""
-        cutoff = datetime.now() - timedelta(seconds=self.max_duration)
-        while self.utterances and self.utterances[0].timestamp < cutoff:
-            self.utterances.popleft()
+        cutoff = time.monotonic() - self.max_duration
+        utts = self.utterances
+        if not utts or utts[0].timestamp >= cutoff:
+            return
+
+        pop = utts.popleft
+        pop_line = self._formatted_lines.popleft
+        last_prospect = self._last_prospect
+        while utts and utts[0].timestamp < cutoff:
+            # Everything after the newest prospect line is newer still, so once
+            # it ages out no prospect line is left
+            pop_line()
+            if pop() is last_prospect:
+                self._last_prospect = None
+        recent = self._recent_lower
+        while len(recent) > len(utts):
+            recent.popleft()
 
     def get_context_string(self, last_n: Optional[int] = None) -> str:
         """
@@ -100,20 +197,18 @@ class ConversationBuffer:
         Returns:
             Formatted conversation transcript
         """
-        utterances = [u for u in self.utterances if u.is_final]
-        if last_n:
-            utterances = utterances[-last_n:]
+        # Join the deque directly when it holds no more than requested
+        if not last_n or last_n >= len(self._formatted_lines):
+            return "\n".join(self._formatted_lines)
 
-        return "\n".join(
-            [f"{u.speaker.title()}: {u.text}" for u in utterances]
-        )
+        # Walk back from the newest line instead of copying the whole deque
+        lines = list(islice(reversed(self._formatted_lines), last_n))
+        lines.reverse()
+        return "\n".join(lines)
 
     def get_last_prospect_statement(self) -> Optional[str]:
         """Get the most recent prospect utterance."""
-        for utterance in reversed(self.utterances):
-            if utterance.speaker == "prospect" and utterance.is_final:
-                return utterance.text
-        return None
+        return self._last_prospect.text if self._last_prospect else None
 
     def get_current_text(self) -> Optional[str]:
         """Get current text including any pending interim result."""
@@ -141,24 +236,58 @@ class ConversationBuffer:
         if not self.utterances:
             return False
 
-        # Check cooldown
-        if self.last_suggestion_time:
-            elapsed = (datetime.now() - self.last_suggestion_time).total_seconds()
-            if elapsed < self.suggestion_cooldown:
-                return False
+        if self._in_cooldown():
+            return False
 
         last = self.utterances[-1]
 
         # Only trigger on final prospect utterances
-        if last.speaker != "prospect" or not last.is_final:
+        if last.speaker != PROSPECT or not last.is_final:
             return False
 
         # Require minimum text length
-        if len(last.text) < 10:
+        if len(last.text) < MIN_TRIGGER_LENGTH:
             return False
 
         return True
 
+    def take_stable_interim(self, stability_seconds: float) -> Optional[str]:
+        """
+        Commit a prospect interim result that has stopped changing.
+
+        An interim whose text has been unchanged for stability_seconds is
+        treated as final for triggering purposes, so suggestions don't wait
+        on Deepgram's endpointing. It is not added to the history; the real
+        final will be. Each interim is committed at most once.
+
+        Args:
+            stability_seconds: How long the text must be unchanged
+
+        Returns:
+            The stable text if suggestions should be generated, else None
+        """
+        interim = self._pending_interim
+        if interim is None or self._interim_committed:
+            return None
+
+        if interim.speaker != PROSPECT or len(interim.text) < MIN_TRIGGER_LENGTH:
+            return None
+
+        if time.monotonic() - interim.timestamp < stability_seconds:
+            return None
+
+        if self._in_cooldown():
+            return None
+
+        self._interim_committed = True
+        return interim.text
+
+    def _in_cooldown(self) -> bool:
+        """Whether suggestions were sent within the cooldown window."""
+        if self.last_suggestion_time is None:
+            return False
+        return time.monotonic() - self.last_suggestion_time < self.suggestion_cooldown
+
     def check_for_objection(self) -> Optional[str]:
         """
         Check if recent conversation contains objection triggers.
@@ -166,26 +295,27 @@ class ConversationBuffer:
         Returns:
             Matched trigger phrase or None
         """
-        # Get last 3 utterances as text
-        recent = list(self.utterances)[-3:]
-        recent_text = " ".join([u.text.lower() for u in recent])
-
-        for phrase in OBJECTION_TRIGGERS:
-            if phrase in recent_text:
-                logger.info(f"Detected objection trigger: '{phrase}'")
-                return phrase
+        # Last 3 utterances, lowercased once when they were added
+        recent_text = " ".join(self._recent_lower)
 
-        return None
+        phrase = _find_trigger(recent_text)
+        if phrase:
+            logger.info(f"Detected objection trigger: '{phrase}'")
+        return phrase
 
     def mark_suggestion_sent(self) -> None:
         """Mark that a suggestion was just sent (for cooldown)."""
-        self.last_suggestion_time = datetime.now()
+        self.last_suggestion_time = time.monotonic()
 
     def clear(self) -> None:
         """Clear all utterances."""
         self.utterances.clear()
+        self._recent_lower.clear()
+        self._formatted_lines.clear()
+        self._last_prospect = None
         self.last_suggestion_time = None
         self._pending_interim = None
+        self._interim_committed = False
         logger.info("Conversation buffer cleared")
 
     @property
@@ -198,9 +328,7 @@ class ConversationBuffer:
         """Duration of conversation in buffer."""
         if len(self.utterances) < 2:
             return 0
-        first = self.utterances[0].timestamp
-        last = self.utterances[-1].timestamp
-        return (last - first).total_seconds()
+        return self.utterances[-1].timestamp - self.utterances[0].timestamp
 
     def to_dict(self) -> dict:
         """Export buffer state for debugging."""
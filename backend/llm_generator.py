@@ -6,20 +6,26 @@ Uses Claude API to generate response suggestions.
 import logging
 import os
 import re
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import anthropic
+import httpx
 
 from config import get_system_prompt
 
 logger = logging.getLogger(__name__)
 
+# Numbered suggestion line: "1.", "1)", "1:", "1 -", etc.
+_SUGGESTION_RE = re.compile(r"^\s*(\d+)[.\):\-]\s*(.+)$")
+
 
 class SuggestionGenerator:
     """
     Generates sales response suggestions using Claude API.
     """
 
+    MAX_SUGGESTIONS = 3
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -44,81 +50,49 @@ class SuggestionGenerator:
         self.max_tokens = max_tokens
         self.temperature = temperature
 
-        self._client = anthropic.Anthropic(api_key=self.api_key)
+        # Long-lived HTTP/2 pool so later calls skip the TCP/TLS handshake.
+        # Built via the SDK's client class so it matches the SDK's transport.
+        self._http = anthropic.DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60.0),
+        )
+        self._client = anthropic.AsyncAnthropic(
+            api_key=self.api_key,
+            http_client=self._http,
+            timeout=30.0,
+        )
         logger.info(f"Initialized suggestion generator with model: {model}")
 
     async def generate(
         self,
         conversation_context: str,
         last_statement: str,
-    ) -> list[str]:
+    ) -> AsyncIterator[str]:
         """
-        Generate response suggestions for the current conversation.
-
-        Args:
-            conversation_context: Recent conversation transcript
-            last_statement: Most recent prospect statement
-
-        Returns:
-            List of 2-3 suggestion strings
-        """
-        if not last_statement or not last_statement.strip():
-            logger.warning("Empty last statement, skipping suggestion generation")
-            return []
-
-        system_prompt = get_system_prompt(conversation_context, last_statement)
-
-        try:
-            logger.debug(f"Generating suggestions for: {last_statement[:50]}...")
-
-            response = self._client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": "Generate response suggestions now."}
-                ],
-            )
-
-            raw_response = response.content[0].text
-            suggestions = self._parse_suggestions(raw_response)
+        Stream response suggestions for the current conversation.
 
-            logger.info(f"Generated {len(suggestions)} suggestions")
-            return suggestions
-
-        except anthropic.APIError as e:
-            logger.error(f"Anthropic API error: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error generating suggestions: {e}")
-            return []
-
-    def generate_sync(
-        self,
-        conversation_context: str,
-        last_statement: str,
-    ) -> list[str]:
-        """
-        Synchronous version of generate().
+        Each suggestion is yielded as soon as its numbered line of the
+        response is complete, so callers can show the first one while the
+        rest are still being generated.
 
         Args:
             conversation_context: Recent conversation transcript
             last_statement: Most recent prospect statement
 
-        Returns:
-            List of 2-3 suggestion strings
+        Yields:
+            Up to 3 suggestion strings
         """
         if not last_statement or not last_statement.strip():
             logger.warning("Empty last statement, skipping suggestion generation")
-            return []
+            return
 
         system_prompt = get_system_prompt(conversation_context, last_statement)
+        count = 0
 
         try:
-            logger.debug(f"Generating suggestions for: {last_statement[:50]}...")
+            logger.debug("Generating suggestions for: %.50s...", last_statement)
 
-            response = self._client.messages.create(
+            async with self._client.messages.stream(
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
@@ -126,63 +100,61 @@ class SuggestionGenerator:
                 messages=[
                     {"role": "user", "content": "Generate response suggestions now."}
                 ],
-            )
-
-            raw_response = response.content[0].text
-            suggestions = self._parse_suggestions(raw_response)
-
-            logger.info(f"Generated {len(suggestions)} suggestions")
-            return suggestions
+            ) as stream:
+                async for line in self._iter_lines(stream.text_stream):
+                    suggestion = self._parse_line(line)
+                    if suggestion:
+                        count += 1
+                        yield suggestion
+                        # Limit to 3 suggestions; leaving the block ends the stream
+                        if count >= self.MAX_SUGGESTIONS:
+                            break
+
+            logger.info(f"Generated {count} suggestions")
 
         except anthropic.APIError as e:
             logger.error(f"Anthropic API error: {e}")
-            return []
         except Exception as e:
             logger.error(f"Error generating suggestions: {e}")
-            return []
 
-    def _parse_suggestions(self, response: str) -> list[str]:
+    @staticmethod
+    async def _iter_lines(text_stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Regroup streamed text deltas into complete lines."""
+        buffer = ""
+        async for text in text_stream:
+            buffer += text
+            while "\n" in buffer:
+                line, buffer = buffer.split("\n", 1)
+                yield line
+        if buffer:
+            yield buffer
+
+    @staticmethod
+    def _parse_line(line: str) -> Optional[str]:
         """
-        Parse numbered suggestions from Claude response.
+        Parse a single numbered suggestion line.
 
         Args:
-            response: Raw response text from Claude
+            line: One line of the Claude response
 
         Returns:
-            List of cleaned suggestion strings
+            Cleaned suggestion string, or None if the line isn't a suggestion
         """
-        suggestions = []
-        lines = response.strip().split("\n")
-
-        # Pattern to match numbered items: "1.", "1)", "1 -", etc.
-        pattern = r"^\s*(\d+)[.\):\-]\s*(.+)$"
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            match = re.match(pattern, line)
-            if match:
-                suggestion = match.group(2).strip()
-
-                # Remove surrounding quotes if present
-                if (
-                    (suggestion.startswith('"') and suggestion.endswith('"'))
-                    or (suggestion.startswith("'") and suggestion.endswith("'"))
-                ):
-                    suggestion = suggestion[1:-1]
-
-                # Remove leading/trailing special chars
-                suggestion = suggestion.strip("\"'")
+        match = _SUGGESTION_RE.match(line.strip())
+        if not match:
+            return None
 
-                if suggestion and len(suggestion) > 5:
-                    suggestions.append(suggestion)
+        # Remove surrounding quotes
+        suggestion = match.group(2).strip().strip("\"'")
+        if suggestion and len(suggestion) > 5:
+            return suggestion
+        return None
 
-        # Limit to 3 suggestions
-        return suggestions[:3]
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._http.aclose()
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """
         Test API connection.
 
@@ -190,7 +162,7 @@ class SuggestionGenerator:
             True if connection successful
         """
         try:
-            response = self._client.messages.create(
+            await self._client.messages.create(
                 model=self.model,
                 max_tokens=10,
                 messages=[{"role": "user", "content": "Hi"}],
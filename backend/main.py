@@ -5,6 +5,7 @@ Orchestrates audio capture, transcription, and suggestion generation.
 
 import asyncio
 import logging
+import math
 import os
 import signal
 import sys
@@ -16,7 +17,7 @@ from dotenv import load_dotenv
 
 from audio_capture import AudioCapture
 from transcription import DeepgramTranscriber, TranscriptResult
-from context_manager import ConversationBuffer
+from context_manager import ConversationBuffer, PROSPECT
 from llm_generator import SuggestionGenerator
 from websocket_server import WebSocketServer
 
@@ -24,8 +25,8 @@ from websocket_server import WebSocketServer
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
-# Configure logging - temporarily enable DEBUG
-log_level = logging.DEBUG  # TODO: change back to: logging.DEBUG if os.environ.get("DEBUG") == "1" else logging.INFO
+# Configure logging (DEBUG=1 for verbose output)
+log_level = logging.DEBUG if os.environ.get("DEBUG") == "1" else logging.INFO
 logging.basicConfig(
     level=log_level,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -44,6 +45,11 @@ class SalesAssistant:
     Main application class that orchestrates all components.
     """
 
+    # Seconds to wait for follow-up finals before checking for a trigger
+    TRIGGER_DEBOUNCE = 0.2
+    # An interim unchanged this long triggers suggestions before its final
+    INTERIM_STABILITY = 0.3
+
     def __init__(self):
         """Initialize the sales assistant."""
         self.audio_capture = AudioCapture(
@@ -55,6 +61,9 @@ class SalesAssistant:
             sample_rate=16000,
             channels=1,
             enable_diarization=True,
+            interim_results=True,
+            endpointing=300,
+            utterance_end_ms=1000,
         )
         self.context_buffer = ConversationBuffer(
             max_duration_seconds=180,
@@ -69,7 +78,11 @@ class SalesAssistant:
         self._is_running = False
         self._is_listening = False
         self._audio_task: asyncio.Task | None = None
+        self._interim_handle: asyncio.TimerHandle | None = None
+        self._interim_task: asyncio.Task | None = None
         self._generation_lock = asyncio.Lock()
+        self._trigger_handle: asyncio.TimerHandle | None = None
+        self._stop_event = asyncio.Event()
 
     async def start(self) -> None:
         """Start the sales assistant."""
@@ -85,16 +98,21 @@ class SalesAssistant:
         logger.info("Sales Assistant ready. Waiting for client connections...")
 
         # Keep running until stopped
-        while self._is_running:
-            await asyncio.sleep(1)
+        await self._stop_event.wait()
+
+    def request_stop(self) -> None:
+        """Wake start() so the caller can shut down."""
+        self._stop_event.set()
 
     async def stop(self) -> None:
         """Stop the sales assistant."""
         logger.info("Stopping Sales Assistant...")
 
         self._is_running = False
+        self._stop_event.set()
         await self._stop_listening()
         await self.websocket_server.stop()
+        await self.suggestion_generator.aclose()
 
         logger.info("Sales Assistant stopped")
 
@@ -144,6 +162,23 @@ class SalesAssistant:
 
         self._is_listening = False
 
+        # Drop any pending suggestion triggers
+        if self._trigger_handle:
+            self._trigger_handle.cancel()
+            self._trigger_handle = None
+        if self._interim_handle:
+            self._interim_handle.cancel()
+            self._interim_handle = None
+
+        # Cancel suggestions started from a stable interim
+        if self._interim_task:
+            self._interim_task.cancel()
+            try:
+                await self._interim_task
+            except asyncio.CancelledError:
+                pass
+            self._interim_task = None
+
         # Cancel audio task
         if self._audio_task:
             self._audio_task.cancel()
@@ -176,7 +211,15 @@ class SalesAssistant:
         # Audio level tracking for debugging
         last_level_log = time.time()
         level_log_interval = 2.0  # Log audio level every 2 seconds
-        recent_levels = []
+        # Running sum of squares over the interval; RMS is derived only when
+        # logging. Samples are squared via a reused float32 scratch + BLAS dot
+        # instead of a fresh float64 copy per chunk.
+        ss_accum = 0.0
+        ss_count = 0
+        scratch = np.empty(
+            self.audio_capture.blocksize * self.audio_capture.channels,
+            dtype=np.float32,
+        )
 
         try:
             while self._is_listening:
@@ -185,21 +228,25 @@ class SalesAssistant:
                 if audio_data is None:
                     continue
 
-                # Calculate audio level for debugging
-                rms = np.sqrt(np.mean(audio_data.astype(np.float64) ** 2))
-                recent_levels.append(rms)
+                # Accumulate audio level for debugging
+                samples = audio_data.reshape(-1)
+                buf = scratch[: samples.size]
+                np.copyto(buf, samples)
+                ss_accum += float(np.dot(buf, buf))
+                ss_count += samples.size
 
                 # Log and broadcast audio level periodically
                 now = time.time()
                 if now - last_level_log >= level_log_interval:
-                    avg_level = float(np.mean(recent_levels)) if recent_levels else 0.0
-                    peak_level = float(np.max(recent_levels)) if recent_levels else 0.0
+                    avg_level = math.sqrt(ss_accum / ss_count) if ss_count else 0.0
                     has_audio = avg_level > 100
 
                     if has_audio:
-                        logger.info(f"Audio level: avg={avg_level:.0f}, peak={peak_level:.0f} - AUDIO DETECTED")
+                        logger.info(
+                            "Audio level: rms=%.0f - AUDIO DETECTED", avg_level
+                        )
                     else:
-                        logger.debug(f"Audio level: avg={avg_level:.0f}, peak={peak_level:.0f} - silence")
+                        logger.debug("Audio level: rms=%.0f - silence", avg_level)
 
                     # Broadcast to frontend for visualization (in try/except to not crash the loop)
                     try:
@@ -207,11 +254,13 @@ class SalesAssistant:
                     except Exception as e:
                         logger.warning(f"Failed to broadcast audio level: {e}")
 
-                    recent_levels = []
+                    ss_accum = 0.0
+                    ss_count = 0
                     last_level_log = now
 
-                # Send to Deepgram
-                await self.transcriber.send_audio(audio_data.tobytes())
+                # Send to Deepgram; the chunk is ours, so pass its buffer
+                # directly instead of copying it with tobytes()
+                await self.transcriber.send_audio(memoryview(audio_data).cast("B"))
 
         except asyncio.CancelledError:
             pass
@@ -232,33 +281,71 @@ class SalesAssistant:
             is_final=result.is_final,
         )
 
-        # Schedule async broadcast and suggestion generation
-        asyncio.create_task(self._process_transcript(result))
-
-    async def _process_transcript(self, result: TranscriptResult) -> None:
-        """Process transcript result and potentially generate suggestions."""
-        # Map speaker ID to label
-        speaker_label = "prospect" if result.speaker == 0 else "salesperson"
+        # Schedule async broadcast
+        asyncio.create_task(self._broadcast_transcript(result))
+
+        # Finals are debounced so a sentence Deepgram splits into several
+        # finals triggers once. A prospect interim (only sent when its text
+        # changed) rearms the stability timer, so it fires once the text has
+        # held still for INTERIM_STABILITY.
+        if result.is_final:
+            if self._trigger_handle:
+                self._trigger_handle.cancel()
+            self._trigger_handle = asyncio.get_running_loop().call_later(
+                self.TRIGGER_DEBOUNCE, self._fire_trigger
+            )
+        elif ConversationBuffer.speaker_label(result.speaker) == PROSPECT:
+            if self._interim_handle:
+                self._interim_handle.cancel()
+            self._interim_handle = asyncio.get_running_loop().call_later(
+                self.INTERIM_STABILITY, self._fire_interim_trigger
+            )
 
-        # Broadcast transcript to clients
+    async def _broadcast_transcript(self, result: TranscriptResult) -> None:
+        """Broadcast transcript result to clients."""
         await self.websocket_server.broadcast_transcript(
             text=result.text,
-            speaker=speaker_label,
+            speaker=ConversationBuffer.speaker_label(result.speaker),
             is_final=result.is_final,
         )
 
-        # Check if we should generate suggestions
-        if result.is_final and self.context_buffer.should_trigger_ai():
+    def _fire_trigger(self) -> None:
+        """Debounce timer callback for final transcripts."""
+        self._trigger_handle = None
+        asyncio.create_task(self._maybe_trigger_ai())
+
+    def _fire_interim_trigger(self) -> None:
+        """Stability timer callback for prospect interim transcripts."""
+        self._interim_handle = None
+        # A running task already holds the generation lock
+        if self._interim_task and not self._interim_task.done():
+            return
+        statement = self.context_buffer.take_stable_interim(self.INTERIM_STABILITY)
+        if statement:
+            self._interim_task = asyncio.create_task(
+                self._generate_suggestions(statement)
+            )
+
+    async def _maybe_trigger_ai(self) -> None:
+        """Generate suggestions if the conversation calls for them."""
+        if self.context_buffer.should_trigger_ai():
             await self._generate_suggestions()
 
-    async def _generate_suggestions(self) -> None:
-        """Generate and broadcast AI suggestions."""
+    async def _generate_suggestions(self, last_statement: str | None = None) -> None:
+        """
+        Generate and broadcast AI suggestions.
+
+        Args:
+            last_statement: Prospect statement to respond to (defaults to the
+                last final prospect utterance)
+        """
         # Use lock to prevent concurrent generation
         if self._generation_lock.locked():
             return
 
         async with self._generation_lock:
-            last_statement = self.context_buffer.get_last_prospect_statement()
+            if last_statement is None:
+                last_statement = self.context_buffer.get_last_prospect_statement()
             if not last_statement:
                 return
 
@@ -266,18 +353,17 @@ class SalesAssistant:
 
             logger.info(f"Generating suggestions for: {last_statement[:50]}...")
 
-            # Run generation in thread pool to not block
-            loop = asyncio.get_event_loop()
-            suggestions = await loop.run_in_executor(
-                None,
-                self.suggestion_generator.generate_sync,
-                context,
-                last_statement,
-            )
+            # Push the growing list to clients as each suggestion completes
+            suggestions: list[str] = []
+            async for suggestion in self.suggestion_generator.generate(
+                context, last_statement
+            ):
+                if not suggestions:
+                    self.context_buffer.mark_suggestion_sent()
+                suggestions.append(suggestion)
+                await self.websocket_server.broadcast_suggestions(list(suggestions))
 
             if suggestions:
-                self.context_buffer.mark_suggestion_sent()
-                await self.websocket_server.broadcast_suggestions(suggestions)
                 logger.info(f"Broadcast {len(suggestions)} suggestions")
 
     async def _handle_client_message(self, data: dict) -> dict | None:
@@ -329,7 +415,8 @@ async def main():
 
     def signal_handler():
         logger.info("Received shutdown signal")
-        asyncio.create_task(assistant.stop())
+        # start() returns immediately; stop() then runs once in the finally below
+        assistant.request_stop()
 
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, signal_handler)
@@ -4,19 +4,45 @@ Handles real-time speech-to-text via WebSocket streaming.
 """
 
 import asyncio
-import json
+import inspect
 import logging
 import os
+from collections import deque
+from urllib.parse import urlencode
 from typing import Optional, Callable, Any
 from dataclasses import dataclass
 
+import orjson
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+class _LogView:
+    """
+    Lazy printable form of a parsed message for %-style log arguments.
+
+    simdjson views don't show their contents, so they are minified, but
+    only if the record is actually formatted.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def __str__(self) -> str:
+        mini = getattr(self.data, "mini", None)
+        return str(self.data) if mini is None else mini.decode()
+
+
+@dataclass(slots=True)
 class TranscriptResult:
     """Represents a transcription result from Deepgram."""
 
@@ -34,6 +60,8 @@ class DeepgramTranscriber:
     """
 
     DEEPGRAM_URL = "wss://api.deepgram.com/v1/listen"
+    # Largest coalesced audio frame, in bytes (~1 s of 16 kHz mono int16)
+    MAX_SEND_BYTES = 32768
 
     def __init__(
         self,
@@ -43,6 +71,9 @@ class DeepgramTranscriber:
         language: str = "en",
         model: str = "nova-2",
         enable_diarization: bool = True,
+        interim_results: bool = True,
+        endpointing: int = 300,
+        utterance_end_ms: Optional[int] = 1000,
     ):
         """
         Initialize Deepgram transcriber.
@@ -54,6 +85,10 @@ class DeepgramTranscriber:
             language: Language code (e.g., 'en', 'es')
             model: Deepgram model to use
             enable_diarization: Enable speaker diarization
+            interim_results: Stream interim (non-final) results
+            endpointing: Silence in ms before Deepgram finalizes a result
+            utterance_end_ms: Word gap in ms that emits UtteranceEnd
+                (requires interim_results; None to disable)
         """
         self.api_key = api_key or os.environ.get("DEEPGRAM_API_KEY")
         if not self.api_key:
@@ -64,31 +99,47 @@ class DeepgramTranscriber:
         self.language = language
         self.model = model
         self.enable_diarization = enable_diarization
+        self.interim_results = interim_results
+        self.endpointing = endpointing
+        self.utterance_end_ms = utterance_end_ms
+
+        # URL and auth header don't change for the transcriber's lifetime
+        self._url = self._build_url()
+        self._headers = {"Authorization": f"Token {self.api_key}"}
 
         self._websocket: Optional[websockets.WebSocketClientProtocol] = None
         self._is_connected = False
-        self._transcript_callback: Optional[Callable[[TranscriptResult], Any]] = None
+        self._dispatch: Optional[Callable[[TranscriptResult], Any]] = None
+        self._last_interim_text: Optional[str] = None
+        # pysimdjson parses on demand, so only the fields _handle_results
+        # reads are materialized, not the per-word array
+        self._parser = simdjson.Parser() if simdjson is not None else None
         self._send_task: Optional[asyncio.Task] = None
         self._receive_task: Optional[asyncio.Task] = None
-        self._audio_queue: Optional[asyncio.Queue] = None
+        # Single producer (send_audio) / single consumer (_send_audio), so a
+        # bare deque plus a wakeup event is enough
+        self._audio_buf: deque = deque()
+        self._audio_ready = asyncio.Event()
 
     def _build_url(self) -> str:
         """Build Deepgram WebSocket URL with parameters."""
-        params = [
-            f"encoding=linear16",
-            f"sample_rate={self.sample_rate}",
-            f"channels={self.channels}",
-            f"language={self.language}",
-            f"model={self.model}",
-            f"punctuate=true",
-            f"interim_results=true",
-            f"endpointing=300",
-            f"vad_events=true",
-        ]
+        params = {
+            "encoding": "linear16",
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "language": self.language,
+            "model": self.model,
+            "punctuate": "true",
+            "interim_results": str(self.interim_results).lower(),
+            "endpointing": self.endpointing,
+            "vad_events": "true",
+        }
         if self.enable_diarization:
-            params.append("diarize=true")
+            params["diarize"] = "true"
+        if self.utterance_end_ms is not None and self.interim_results:
+            params["utterance_end_ms"] = self.utterance_end_ms
 
-        return f"{self.DEEPGRAM_URL}?{'&'.join(params)}"
+        return f"{self.DEEPGRAM_URL}?{urlencode(params)}"
 
     async def connect(
         self,
@@ -98,24 +149,34 @@ class DeepgramTranscriber:
         Connect to Deepgram WebSocket.
 
         Args:
-            transcript_callback: Called with each transcript result
+            transcript_callback: Called with each transcript result; async
+                callbacks are scheduled as tasks so they never stall the
+                receive loop
         """
         if self._is_connected:
             logger.warning("Already connected to Deepgram")
             return
 
-        self._transcript_callback = transcript_callback
-        self._audio_queue = asyncio.Queue()
+        # Pick the dispatch path once instead of checking per message
+        if inspect.iscoroutinefunction(transcript_callback):
+            self._dispatch = lambda result: asyncio.create_task(
+                self._run_async_callback(transcript_callback, result)
+            )
+        else:
+            self._dispatch = transcript_callback
 
-        url = self._build_url()
-        headers = {"Authorization": f"Token {self.api_key}"}
+        self._audio_buf.clear()
+        self._audio_ready.clear()
+        self._last_interim_text = None
 
         try:
             self._websocket = await websockets.connect(
-                url,
-                additional_headers=headers,
+                self._url,
+                additional_headers=self._headers,
                 ping_interval=20,
                 ping_timeout=10,
+                # PCM audio doesn't deflate; compressing it only burns CPU
+                compression=None,
             )
             self._is_connected = True
             logger.info("Connected to Deepgram")
@@ -158,31 +219,45 @@ class DeepgramTranscriber:
                 pass
             self._websocket = None
 
+        # Drop audio that was never sent
+        self._audio_buf.clear()
+
         logger.info("Disconnected from Deepgram")
 
-    async def send_audio(self, audio_data: bytes) -> None:
+    async def send_audio(self, audio_data: bytes | memoryview) -> None:
         """
         Queue audio data for sending to Deepgram.
 
         Args:
-            audio_data: Raw audio bytes (int16 PCM)
+            audio_data: Raw audio bytes or byte memoryview (int16 PCM); it must
+                not be modified until sent
         """
-        if self._audio_queue and self._is_connected:
-            await self._audio_queue.put(audio_data)
+        if self._is_connected:
+            self._audio_buf.append(audio_data)
+            self._audio_ready.set()
 
     async def _send_audio(self) -> None:
         """Task to send queued audio to Deepgram."""
         try:
+            buf = self._audio_buf
             while self._is_connected and self._websocket:
                 try:
-                    # Get audio from queue with timeout
-                    audio_data = await asyncio.wait_for(
-                        self._audio_queue.get(),
-                        timeout=1.0,
-                    )
-                    await self._websocket.send(audio_data)
-                except asyncio.TimeoutError:
-                    continue
+                    # Wait for audio; disconnect() cancels this task, so no
+                    # timeout is needed to notice shutdown
+                    if not buf:
+                        self._audio_ready.clear()
+                        await self._audio_ready.wait()
+                    # Coalesce queued chunks into one frame; linear16 is a
+                    # plain byte stream, so the split points don't matter
+                    while buf:
+                        chunks = [buf.popleft()]
+                        size = len(chunks[0])
+                        while buf and size + len(buf[0]) <= self.MAX_SEND_BYTES:
+                            size += len(buf[0])
+                            chunks.append(buf.popleft())
+                        await self._websocket.send(
+                            chunks[0] if len(chunks) == 1 else b"".join(chunks)
+                        )
                 except ConnectionClosed:
                     logger.warning("Deepgram connection closed while sending")
                     break
@@ -196,9 +271,16 @@ class DeepgramTranscriber:
         try:
             while self._is_connected and self._websocket:
                 try:
-                    message = await self._websocket.recv()
-                    data = json.loads(message)
-                    self._process_message(data)
+                    # Raw bytes: skips the UTF-8 decode, and orjson parses bytes
+                    message = await self._websocket.recv(decode=False)
+                    # Interim results with an empty transcript (silence) are
+                    # dropped without parsing
+                    if (
+                        b'"transcript":""' in message
+                        and b'"is_final":true' not in message
+                    ):
+                        continue
+                    self._process_frame(message)
                 except ConnectionClosed:
                     logger.warning("Deepgram connection closed while receiving")
                     break
@@ -207,6 +289,15 @@ class DeepgramTranscriber:
         except Exception as e:
             logger.error(f"Error receiving from Deepgram: {e}")
 
+    def _process_frame(self, message: bytes) -> None:
+        """Parse a raw Deepgram frame and process it."""
+        if self._parser is not None:
+            # The lazy document must not outlive this call: the parser
+            # refuses to parse again while views into the old one exist
+            self._process_message(self._parser.parse(message))
+        else:
+            self._process_message(orjson.loads(message))
+
     def _process_message(self, data: dict) -> None:
         """Process a message from Deepgram."""
         msg_type = data.get("type")
@@ -214,55 +305,65 @@ class DeepgramTranscriber:
         if msg_type == "Results":
             self._handle_results(data)
         elif msg_type == "Metadata":
-            logger.debug(f"Deepgram metadata: {data}")
+            logger.debug("Deepgram metadata: %s", _LogView(data))
         elif msg_type == "SpeechStarted":
             logger.debug("Speech started")
         elif msg_type == "UtteranceEnd":
             logger.debug("Utterance ended")
         else:
-            logger.debug(f"Unknown Deepgram message type: {msg_type}")
+            logger.debug("Unknown Deepgram message type: %s", msg_type)
 
     def _handle_results(self, data: dict) -> None:
         """Handle transcription results."""
-        channel = data.get("channel", {})
-        alternatives = channel.get("alternatives", [])
-
-        if not alternatives:
-            return
-
-        alt = alternatives[0]
-        transcript = alt.get("transcript", "").strip()
-
-        if not transcript:
+        try:
+            alt = data["channel"]["alternatives"][0]
+            transcript = alt["transcript"].strip()
+            if not transcript:
+                return
+
+            is_final = data["is_final"]
+            # Deepgram often resends an interim unchanged
+            if is_final:
+                self._last_interim_text = None
+            elif transcript == self._last_interim_text:
+                return
+            else:
+                self._last_interim_text = transcript
+
+            # Get speaker from first word if diarization enabled
+            words = alt["words"]
+            speaker = words[0].get("speaker", 0) if words else 0
+
+            start_time = data["start"]
+            result = TranscriptResult(
+                transcript,
+                speaker,
+                is_final,
+                alt["confidence"],
+                start_time,
+                start_time + data["duration"],
+            )
+        except (KeyError, IndexError, TypeError):
+            logger.debug("Malformed Deepgram result: %s", _LogView(data))
             return
 
-        # Get speaker from first word if diarization enabled
-        words = alt.get("words", [])
-        speaker = 0
-        if words:
-            speaker = words[0].get("speaker", 0)
-
-        # Get timing info
-        start_time = data.get("start", 0.0)
-        duration = data.get("duration", 0.0)
-        is_final = data.get("is_final", False)
-        confidence = alt.get("confidence", 0.0)
-
-        result = TranscriptResult(
-            text=transcript,
-            speaker=speaker,
-            is_final=is_final,
-            confidence=confidence,
-            start_time=start_time,
-            end_time=start_time + duration,
-        )
-
-        if self._transcript_callback:
+        if self._dispatch:
             try:
-                self._transcript_callback(result)
+                self._dispatch(result)
             except Exception as e:
                 logger.error(f"Error in transcript callback: {e}")
 
+    @staticmethod
+    async def _run_async_callback(
+        callback: Callable[[TranscriptResult], Any],
+        result: TranscriptResult,
+    ) -> None:
+        """Await an async transcript callback, logging its errors."""
+        try:
+            await callback(result)
+        except Exception as e:
+            logger.error(f"Error in transcript callback: {e}")
+
     @property
     def is_connected(self) -> bool:
         """Check if connected to Deepgram."""
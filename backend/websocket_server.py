@@ -4,11 +4,12 @@ Handles IPC between Python backend and Electron frontend.
 """
 
 import asyncio
-import json
 import logging
+from functools import lru_cache
 from typing import Set, Callable, Optional, Any
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 
+import orjson
 import websockets
 from websockets.server import WebSocketServerProtocol
 from websockets.exceptions import ConnectionClosed
@@ -16,7 +17,7 @@ from websockets.exceptions import ConnectionClosed
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptMessage:
     """Message containing transcript data."""
 
@@ -26,7 +27,7 @@ class TranscriptMessage:
     is_final: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class SuggestionsMessage:
     """Message containing AI suggestions."""
 
@@ -34,7 +35,7 @@ class SuggestionsMessage:
     items: list = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class StatusMessage:
     """Message containing system status."""
 
@@ -44,7 +45,7 @@ class StatusMessage:
     transcribing: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioLevelMessage:
     """Message containing audio level for visualization."""
 
@@ -53,6 +54,33 @@ class AudioLevelMessage:
     has_audio: bool = False
 
 
+def _serialize(message: Any) -> str:
+    """Serialize a message (dataclass, dict, or other) to a JSON string."""
+    # orjson serializes dataclasses natively, without asdict()'s deep copy
+    if not (hasattr(message, "__dataclass_fields__") or isinstance(message, dict)):
+        message = {"data": message}
+    # Decode to str so clients receive a text frame
+    return orjson.dumps(message).decode()
+
+
+# Status and audio-level messages repeat the same few values, so their
+# serialized form is memoized
+@lru_cache(maxsize=64)
+def _serialize_status(listening: bool, connected: bool, transcribing: bool) -> str:
+    return _serialize(
+        StatusMessage(
+            listening=listening,
+            connected=connected,
+            transcribing=transcribing,
+        )
+    )
+
+
+@lru_cache(maxsize=64)
+def _serialize_audio_level(level: float, has_audio: bool) -> str:
+    return _serialize(AudioLevelMessage(level=level, has_audio=has_audio))
+
+
 class WebSocketServer:
     """
     WebSocket server for frontend communication.
@@ -62,6 +90,8 @@ class WebSocketServer:
         self,
         host: str = "localhost",
         port: int = 8765,
+        interim_debounce: float = 0.06,
+        batch_window: float = 0.005,
     ):
         """
         Initialize WebSocket server.
@@ -69,14 +99,25 @@ class WebSocketServer:
         Args:
             host: Host to bind to
             port: Port to listen on
+            interim_debounce: Seconds to coalesce interim transcripts (0 to disable)
+            batch_window: Seconds to collect broadcasts into one batch frame
+                (0 to disable)
         """
         self.host = host
         self.port = port
+        self.interim_debounce = interim_debounce
+        self.batch_window = batch_window
 
         self._clients: Set[WebSocketServerProtocol] = set()
         self._message_handler: Optional[Callable[[dict], Any]] = None
         self._server: Optional[websockets.WebSocketServer] = None
         self._is_running = False
+        self._pending_interim: Optional[TranscriptMessage] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._out_queue: Optional[asyncio.Queue] = None
+        self._pump_task: Optional[asyncio.Task] = None
+        # Last (quantized level, has_audio) broadcast, to skip repeats
+        self._last_audio_level: Optional[tuple[int, bool]] = None
 
     async def start(self) -> None:
         """Start the WebSocket server."""
@@ -90,8 +131,14 @@ class WebSocketServer:
             self.port,
             ping_interval=20,
             ping_timeout=10,
+            # Small JSON messages over localhost; deflate is pure overhead
+            compression=None,
         )
         self._is_running = True
+
+        if self.batch_window > 0:
+            self._out_queue = asyncio.Queue()
+            self._pump_task = asyncio.create_task(self._outbound_pump())
         logger.info(f"WebSocket server started on ws://{self.host}:{self.port}")
 
     async def stop(self) -> None:
@@ -100,12 +147,23 @@ class WebSocketServer:
             return
 
         self._is_running = False
+        self._cancel_pending_interim()
+
+        # Stop the outbound pump after it flushes what is already queued,
+        # such as the listening=False status sent on the way down
+        if self._pump_task:
+            self._out_queue.put_nowait(None)
+            self._out_queue = None
+            try:
+                await asyncio.wait_for(self._pump_task, timeout=1.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._pump_task = None
 
         # Close all client connections
         if self._clients:
             await asyncio.gather(
-                *[client.close() for client in self._clients],
-                return_exceptions=True,
+                *(self._close_client(client) for client in self._clients)
             )
             self._clients.clear()
 
@@ -117,6 +175,14 @@ class WebSocketServer:
 
         logger.info("WebSocket server stopped")
 
+    @staticmethod
+    async def _close_client(websocket: WebSocketServerProtocol) -> None:
+        """Close a client connection, ignoring errors from dead connections."""
+        try:
+            await websocket.close()
+        except Exception as e:
+            logger.debug("Error closing client: %s", e)
+
     async def _handle_connection(
         self,
         websocket: WebSocketServerProtocol,
@@ -138,12 +204,14 @@ class WebSocketServer:
         """Register a new client connection."""
         self._clients.add(websocket)
         logger.info(f"Client connected. Total clients: {len(self._clients)}")
+        # New clients should get the next audio level even if it's unchanged
+        self._last_audio_level = None
 
         # Send initial status
         try:
-            status_msg = StatusMessage(connected=True)
-            logger.debug(f"Sending initial status: {status_msg}")
-            await self._send_to_client(websocket, status_msg)
+            status_msg = _serialize_status(False, True, False)
+            logger.debug("Sending initial status: %s", status_msg)
+            await self._send_raw(websocket, status_msg)
             logger.debug("Initial status sent successfully")
         except Exception as e:
             logger.error(f"Error sending initial status: {e}")
@@ -160,15 +228,15 @@ class WebSocketServer:
     ) -> None:
         """Handle incoming message from client."""
         try:
-            data = json.loads(message)
-            logger.debug(f"Received message: {data.get('type', 'unknown')}")
+            data = orjson.loads(message)
+            logger.debug("Received message: %s", data.get("type", "unknown"))
 
             if self._message_handler:
                 response = await self._message_handler(data)
                 if response:
                     await self._send_to_client(websocket, response)
 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error(f"Invalid JSON message: {message[:100]}")
         except Exception as e:
             logger.error(f"Error handling message: {e}")
@@ -180,14 +248,20 @@ class WebSocketServer:
     ) -> None:
         """Send message to a specific client."""
         try:
-            if hasattr(message, "__dataclass_fields__"):
-                data = asdict(message)
-            elif isinstance(message, dict):
-                data = message
-            else:
-                data = {"data": message}
+            data = _serialize(message)
+        except Exception as e:
+            logger.error(f"Error sending to client: {e}")
+            return
+        await self._send_raw(websocket, data)
 
-            await websocket.send(json.dumps(data))
+    async def _send_raw(
+        self,
+        websocket: WebSocketServerProtocol,
+        data: str,
+    ) -> None:
+        """Send an already-serialized message to a specific client."""
+        try:
+            await websocket.send(data)
         except ConnectionClosed:
             await self._unregister(websocket)
         except Exception as e:
@@ -203,27 +277,83 @@ class WebSocketServer:
         if not self._clients:
             return
 
-        if hasattr(message, "__dataclass_fields__"):
-            data = json.dumps(asdict(message))
-        elif isinstance(message, dict):
-            data = json.dumps(message)
+        await self._enqueue(_serialize(message))
+
+    async def _enqueue(self, data: str, audio_level: bool = False) -> None:
+        """Queue a serialized message for the outbound pump, or send it now."""
+        if not self._clients:
+            return
+
+        if self._out_queue is None:
+            await self._broadcast_serialized(data)
         else:
-            data = json.dumps({"data": message})
+            self._out_queue.put_nowait((data, audio_level))
 
-        # Send to all clients, handling failures gracefully
-        failed_clients = []
-        for client in self._clients:
-            try:
-                await client.send(data)
-            except ConnectionClosed:
-                failed_clients.append(client)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
-                failed_clients.append(client)
+    async def _outbound_pump(self) -> None:
+        """Task that fans out queued broadcasts, one frame per batch window."""
+        loop = asyncio.get_running_loop()
+        queue = self._out_queue
+        try:
+            closing = False
+            while not closing:
+                # None is the shutdown sentinel queued by stop()
+                item = await queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = loop.time() + self.batch_window
+                while (timeout := deadline - loop.time()) > 0:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        closing = True
+                        break
+                    batch.append(item)
+
+                await self._broadcast_batch(batch)
+        except asyncio.CancelledError:
+            pass
+
+    async def _broadcast_batch(self, batch: list[tuple[str, bool]]) -> None:
+        """Broadcast queued (data, audio_level) messages as one frame."""
+        # Only the latest audio level in a window is worth showing
+        msgs = []
+        level = None
+        for data, audio_level in batch:
+            if audio_level:
+                level = data
+            else:
+                msgs.append(data)
+        if level is not None:
+            msgs.append(level)
+
+        if len(msgs) == 1:
+            data = msgs[0]
+        else:
+            # Messages are already JSON, so splice them in as-is
+            data = '{"type":"batch","msgs":[' + ",".join(msgs) + "]}"
+        await self._broadcast_serialized(data)
+
+    async def _broadcast_serialized(self, data: str) -> None:
+        """Send an already-serialized message to all connected clients."""
+        if not self._clients:
+            return
+
+        # Send to all clients concurrently, handling failures gracefully
+        clients = list(self._clients)
+        results = await asyncio.gather(
+            *[client.send(data) for client in clients],
+            return_exceptions=True,
+        )
 
         # Clean up failed connections
-        for client in failed_clients:
-            self._clients.discard(client)
+        for client, result in zip(clients, results):
+            if isinstance(result, Exception):
+                if not isinstance(result, ConnectionClosed):
+                    logger.error(f"Error broadcasting to client: {result}")
+                self._clients.discard(client)
 
     async def broadcast_transcript(
         self,
@@ -239,14 +369,40 @@ class WebSocketServer:
             speaker: Speaker label
             is_final: Whether this is a final result
         """
-        await self.broadcast(
-            TranscriptMessage(
-                text=text,
-                speaker=speaker,
-                is_final=is_final,
-            )
+        message = TranscriptMessage(
+            text=text,
+            speaker=speaker,
+            is_final=is_final,
         )
 
+        # Interim results only matter until the next one arrives, so keep
+        # just the latest and flush it once per debounce window
+        if not is_final and self.interim_debounce > 0:
+            self._pending_interim = message
+            if self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(
+                    self.interim_debounce, self._flush_interim
+                )
+            return
+
+        # Finals go out immediately and supersede any pending interim
+        self._cancel_pending_interim()
+        await self.broadcast(message)
+
+    def _flush_interim(self) -> None:
+        """Broadcast the latest pending interim transcript."""
+        self._flush_handle = None
+        message, self._pending_interim = self._pending_interim, None
+        if message is not None:
+            asyncio.create_task(self.broadcast(message))
+
+    def _cancel_pending_interim(self) -> None:
+        """Drop any interim transcript waiting to be flushed."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending_interim = None
+
     async def broadcast_suggestions(self, suggestions: list[str]) -> None:
         """
         Broadcast AI suggestions to all clients.
@@ -270,13 +426,7 @@ class WebSocketServer:
             connected: Whether backend is connected
             transcribing: Whether transcription is active
         """
-        await self.broadcast(
-            StatusMessage(
-                listening=listening,
-                connected=connected,
-                transcribing=transcribing,
-            )
-        )
+        await self._enqueue(_serialize_status(listening, connected, transcribing))
 
     async def broadcast_audio_level(self, level: float, has_audio: bool = False) -> None:
         """
@@ -286,11 +436,17 @@ class WebSocketServer:
             level: Audio RMS level (0-32767 range for int16)
             has_audio: Whether audio is above silence threshold
         """
-        await self.broadcast(
-            AudioLevelMessage(
-                level=level,
-                has_audio=has_audio,
-            )
+        # Quantize to steps of 128 (256 levels over the int16 range): finer
+        # changes aren't visible, and repeated values hit the serialization
+        # cache
+        level_q = round(level / 128) * 128
+        if (level_q, has_audio) == self._last_audio_level:
+            return
+        self._last_audio_level = (level_q, has_audio)
+
+        await self._enqueue(
+            _serialize_audio_level(float(level_q), has_audio),
+            audio_level=True,
         )
 
     def on_message(self, handler: Callable[[dict], Any]) -> None:
@@ -1,5 +1,5 @@
 import { useEffect, useRef, useCallback, useState } from 'react';
-import type { ServerMessage, ClientCommand } from '../types';
+import type { ServerMessage, BatchMessage, ClientCommand } from '../types';
 
 interface UseWebSocketOptions {
   url: string;
@@ -82,8 +82,12 @@ export function useWebSocket({
 
       ws.onmessage = (event) => {
         try {
-          const message = JSON.parse(event.data) as ServerMessage;
-          onMessage(message);
+          const message = JSON.parse(event.data) as ServerMessage | BatchMessage;
+          if (message.type === 'batch') {
+            message.msgs.forEach(onMessage);
+          } else {
+            onMessage(message);
+          }
         } catch (e) {
           console.error('Failed to parse message:', e);
         }
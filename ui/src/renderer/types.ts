@@ -35,6 +35,12 @@ export type ServerMessage =
   | AckMessage
   | ErrorMessage;
 
+// Several server messages sent in one frame, in order
+export interface BatchMessage {
+  type: 'batch';
+  msgs: ServerMessage[];
+}
+
 // Client commands
 export interface StartListeningCommand {
   type: 'start_listening';